@@ -1,36 +1,46 @@
-use std::io::{self, BufRead};
+use std::io::{self, BufRead, Write};
 use vibe_git::McpClient;
 
-fn main() {
-    let stdin = io::stdin();
+fn main() -> io::Result<()> {
+    let mut stdin = io::stdin().lock();
+    // Lock stdout once rather than on every response.
+    let mut stdout = io::stdout().lock();
     let mut client = McpClient::new();
-    for line in stdin.lock().lines() {
-        let line = match line {
-            Ok(l) => l,
-            Err(_) => continue,
-        };
+    // Reuse one buffer for every command instead of allocating per line.
+    let mut line = String::new();
+    loop {
+        line.clear();
+        match stdin.read_line(&mut line) {
+            Ok(0) => break,
+            Ok(_) => {}
+            // Skip lines that are not valid UTF-8, but stop on real I/O
+            // errors instead of retrying them forever.
+            Err(err) if err.kind() == io::ErrorKind::InvalidData => continue,
+            Err(err) => return Err(err),
+        }
         let mut parts = line.split_whitespace();
         match parts.next() {
             Some("start") => {
                 if let Some(branch) = parts.next() {
                     client.start_vibing(branch);
-                    println!("started {branch}");
+                    writeln!(stdout, "started {branch}")?;
                 } else {
-                    println!("usage: start <branch>");
+                    writeln!(stdout, "usage: start <branch>")?;
                 }
             }
             Some("stop") => {
                 client.stop_vibing();
-                println!("stopped");
+                writeln!(stdout, "stopped")?;
             }
             Some("status") => {
                 if let Some(branch) = client.branch() {
-                    println!("vibing on {branch}");
+                    writeln!(stdout, "vibing on {branch}")?;
                 } else {
-                    println!("idle");
+                    writeln!(stdout, "idle")?;
                 }
             }
-            _ => println!("unknown command"),
+            _ => writeln!(stdout, "unknown command")?,
         }
     }
+    Ok(())
 }
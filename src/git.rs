@@ -0,0 +1,199 @@
+use crate::BranchName;
+use std::{
+    env,
+    fs::{self, File},
+    io::Read,
+    path::{Path, PathBuf},
+    process::{Command, Stdio},
+    str,
+};
+
+/// Walk upward from the current directory to the repository root.
+///
+/// Falls back to the current directory when no `.git` entry is found so that
+/// the git command itself reports the error.
+pub(crate) fn find_git_repo() -> PathBuf {
+    let cwd = || env::current_dir().expect("failed to read current directory");
+    // Probe each level by pushing and popping `.git` on a single buffer
+    // rather than allocating a joined path per ancestor.
+    let mut dir = cwd();
+    loop {
+        dir.push(".git");
+        let found = dir.exists();
+        dir.pop();
+        if found {
+            return dir;
+        }
+        if !dir.pop() {
+            return cwd();
+        }
+    }
+}
+
+/// Build a `git` command that runs against `repo`.
+///
+/// The repository is passed with `-C` rather than `Command::current_dir` so
+/// the standard library can always spawn through `posix_spawn`; setting a
+/// working directory forces a `fork`/`exec` fallback on older libcs.
+pub(crate) fn git(repo: &Path) -> Command {
+    let mut cmd = Command::new("git");
+    cmd.arg("-C").arg(repo);
+    cmd
+}
+
+/// What HEAD pointed at when a session started.
+pub(crate) enum Head {
+    /// A checked-out branch.
+    Branch(BranchName),
+    /// A detached HEAD, recorded by its full object id.
+    Detached(String),
+}
+
+impl Head {
+    /// Revision that `git checkout` takes to return to this HEAD.
+    pub(crate) fn revision(&self) -> &str {
+        match self {
+            Head::Branch(branch) => branch.as_str(),
+            Head::Detached(id) => id,
+        }
+    }
+}
+
+/// Resolve what HEAD points at in `repo`.
+///
+/// `.git/HEAD` is parsed directly; git is only spawned when the file cannot
+/// be read, holds something unrecognised, or is the placeholder left by the
+/// reftable backend.
+pub(crate) fn current_head(repo: &Path) -> Head {
+    let mut buf = [0; 256];
+    read_head(repo, &mut buf)
+        .filter(|head| !head.starts_with(REFTABLE_HEAD))
+        .and_then(parse_head)
+        .unwrap_or_else(|| git_head(repo))
+}
+
+/// Read `.git/HEAD` into `buf` with a single `read`, returning the bytes read.
+///
+/// Returns `None` when the file cannot be read or the bytes read do not end
+/// in the newline git always writes, in which case the ref may have been
+/// truncated by a full buffer or a short read.
+fn read_head<'a>(repo: &Path, buf: &'a mut [u8]) -> Option<&'a [u8]> {
+    let mut file = match File::open(repo.join(".git").join("HEAD")) {
+        Ok(file) => file,
+        Err(_) => File::open(linked_git_dir(repo)?.join("HEAD")).ok()?,
+    };
+    let len = file.read(buf).ok()?;
+    let head = &buf[..len];
+    (len < buf.len() && head.ends_with(b"\n")).then_some(head)
+}
+
+/// Placeholder HEAD written by repositories using the reftable backend.
+const REFTABLE_HEAD: &[u8] = b"ref: refs/heads/.invalid";
+
+/// Parse the contents of a HEAD file.
+///
+/// Matching happens on the raw bytes; only the branch name or object id is
+/// decoded. Returns `None` for anything that is neither a branch ref nor a
+/// full object id.
+fn parse_head(head: &[u8]) -> Option<Head> {
+    let head = head.trim_ascii_end();
+    if let Some(name) = head.strip_prefix(b"ref: refs/heads/") {
+        return str::from_utf8(name)
+            .ok()
+            .map(|name| Head::Branch(name.into()));
+    }
+    let is_object_id = matches!(head.len(), 40 | 64) && head.iter().all(u8::is_ascii_hexdigit);
+    is_object_id.then(|| Head::Detached(String::from_utf8_lossy(head).into_owned()))
+}
+
+/// Follow the `gitdir:` pointer that linked worktrees and submodules keep in
+/// a `.git` file.
+fn linked_git_dir(repo: &Path) -> Option<PathBuf> {
+    let pointer = fs::read_to_string(repo.join(".git")).ok()?;
+    let dir = pointer.strip_prefix("gitdir:")?.trim();
+    Some(repo.join(dir))
+}
+
+/// Ask git what HEAD points at.
+fn git_head(repo: &Path) -> Head {
+    if let Some(branch) = git_stdout(repo, &["symbolic-ref", "--short", "HEAD"]) {
+        return Head::Branch(branch.into());
+    }
+    let id = git_stdout(repo, &["rev-parse", "--verify", "HEAD"]).expect("failed to resolve HEAD");
+    Head::Detached(id)
+}
+
+/// Run a read-only git query, returning its trimmed stdout on success.
+fn git_stdout(repo: &Path, args: &[&str]) -> Option<String> {
+    // Only stdout is read; discard stderr instead of capturing it.
+    let output = git(repo)
+        .args(args)
+        .stderr(Stdio::null())
+        .output()
+        .expect("failed to run git");
+    if !output.status.success() {
+        return None;
+    }
+    let out = str::from_utf8(output.stdout.trim_ascii_end()).ok()?;
+    Some(out.to_owned())
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn parse_head_reads_branch_or_detached() {
+        let branch = parse_head(b"ref: refs/heads/feature/x\n").unwrap();
+        assert_eq!(branch.revision(), "feature/x");
+        let id = "4b825dc642cb6eb9a060e54bf8d69288fbee4904";
+        let detached = parse_head(format!("{id}\n").as_bytes()).unwrap();
+        assert!(matches!(detached, Head::Detached(_)));
+        assert_eq!(detached.revision(), id);
+        assert!(parse_head(b"garbage\n").is_none());
+    }
+
+    #[test]
+    fn read_head_rejects_unterminated_ref() {
+        let dir = tempfile::tempdir().unwrap();
+        fs::create_dir(dir.path().join(".git")).unwrap();
+        let head = dir.path().join(".git").join("HEAD");
+        let mut buf = [0; 256];
+
+        fs::write(&head, "ref: refs/heads/feat").unwrap();
+        assert!(read_head(dir.path(), &mut buf).is_none());
+
+        fs::write(&head, "ref: refs/heads/feature\n").unwrap();
+        assert_eq!(
+            read_head(dir.path(), &mut buf),
+            Some(&b"ref: refs/heads/feature\n"[..])
+        );
+    }
+
+    #[test]
+    fn read_head_follows_relative_gitdir_pointer() {
+        let dir = tempfile::tempdir().unwrap();
+        let worktree = dir.path().join("linked");
+        let git_dir = dir
+            .path()
+            .join("main")
+            .join(".git")
+            .join("worktrees")
+            .join("linked");
+        fs::create_dir_all(&worktree).unwrap();
+        fs::create_dir_all(&git_dir).unwrap();
+        fs::write(
+            worktree.join(".git"),
+            "gitdir: ../main/.git/worktrees/linked\n",
+        )
+        .unwrap();
+        fs::write(git_dir.join("HEAD"), "ref: refs/heads/worktree-base\n").unwrap();
+
+        let mut buf = [0; 256];
+        assert_eq!(
+            read_head(&worktree, &mut buf),
+            Some(&b"ref: refs/heads/worktree-base\n"[..])
+        );
+        assert_eq!(current_head(&worktree).revision(), "worktree-base");
+    }
+}
@@ -1,7 +1,7 @@
-use std::{fmt, marker::PhantomData, process::Command};
+use std::{fmt, path::PathBuf, process::Stdio};
 
 #[derive(Clone, Debug, Eq, PartialEq)]
-pub struct BranchName(String);
+pub struct BranchName(Box<str>);
 
 impl BranchName {
     pub fn as_str(&self) -> &str {
@@ -11,13 +11,13 @@ impl BranchName {
 
 impl From<&str> for BranchName {
     fn from(value: &str) -> Self {
-        Self(value.to_string())
+        Self(value.into())
     }
 }
 
 impl From<String> for BranchName {
     fn from(value: String) -> Self {
-        Self(value)
+        Self(value.into_boxed_str())
     }
 }
 
@@ -33,6 +33,7 @@ impl fmt::Display for BranchName {
     }
 }
 
+mod git;
 mod mcp;
 
 pub use mcp::McpClient;
@@ -40,8 +41,11 @@ pub use mcp::McpClient;
 /// Marker type for the session before it has started.
 pub struct Idle;
 
-/// Marker type for an active vibing session.
-pub struct Vibing;
+/// State of an active vibing session.
+pub struct Vibing {
+    /// HEAD the session started from and returns to on finish.
+    base: git::Head,
+}
 
 /// Marker type for a completed session.
 pub struct Finished;
@@ -49,29 +53,41 @@ pub struct Finished;
 /// A session that transitions through compile-time states.
 pub struct VibeSession<State> {
     branch: BranchName,
-    state: PhantomData<State>,
+    repo: PathBuf,
+    state: State,
 }
 
 impl VibeSession<Idle> {
     /// Create a new session in the idle state.
+    ///
+    /// The repository root is resolved once here and reused by every git
+    /// command the session runs.
     pub fn new(branch: impl Into<BranchName>) -> Self {
         Self {
             branch: branch.into(),
-            state: PhantomData,
+            repo: git::find_git_repo(),
+            state: Idle,
         }
     }
 
     /// Start vibing, transitioning to the `Vibing` state.
+    ///
+    /// Whatever HEAD pointed at beforehand, a branch or a detached commit, is
+    /// remembered as the base so that finishing does not have to guess
+    /// between `main` and `master`.
     pub fn start(self) -> VibeSession<Vibing> {
-        let status = Command::new("git")
-            .args(["checkout", "-b", self.branch.as_ref()])
+        let base = git::current_head(&self.repo);
+        let status = git::git(&self.repo)
+            .args(["checkout", "--quiet", "-b", self.branch.as_ref()])
+            .stdout(Stdio::null())
             .status()
             .expect("failed to run git checkout");
         assert!(status.success(), "git checkout failed");
 
         VibeSession {
             branch: self.branch,
-            state: PhantomData,
+            repo: self.repo,
+            state: Vibing { base },
         }
     }
 }
@@ -79,15 +95,18 @@ impl VibeSession<Idle> {
 impl VibeSession<Vibing> {
     /// Finish vibing, transitioning to the `Finished` state.
     pub fn finish(self) -> VibeSession<Finished> {
-        let status = Command::new("git")
-            .args(["checkout", "main"])
+        let base = self.state.base.revision();
+        let status = git::git(&self.repo)
+            .args(["checkout", "--quiet", base])
+            .stdout(Stdio::null())
             .status()
-            .expect("failed to checkout main");
-        assert!(status.success(), "git checkout main failed");
+            .expect("failed to checkout base");
+        assert!(status.success(), "git checkout {base} failed");
 
         VibeSession {
             branch: self.branch,
-            state: PhantomData,
+            repo: self.repo,
+            state: Finished,
         }
     }
 
@@ -95,6 +114,15 @@ impl VibeSession<Vibing> {
     pub fn branch(&self) -> &BranchName {
         &self.branch
     }
+
+    /// Access the branch the session will return to, or `None` when it
+    /// started from a detached HEAD.
+    pub fn base(&self) -> Option<&BranchName> {
+        match &self.state.base {
+            git::Head::Branch(branch) => Some(branch),
+            git::Head::Detached(_) => None,
+        }
+    }
 }
 
 impl VibeSession<Finished> {
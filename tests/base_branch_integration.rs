@@ -0,0 +1,17 @@
+mod common;
+
+use tempfile::tempdir;
+use vibe_git::{Idle, VibeSession};
+
+#[test]
+fn finish_returns_to_starting_branch() {
+    let dir = tempdir().unwrap();
+    std::env::set_current_dir(&dir).unwrap();
+    common::init_repo("develop");
+
+    let vibing = VibeSession::<Idle>::new("integration-branch").start();
+    assert_eq!(vibing.base().unwrap().as_ref(), "develop");
+
+    vibing.finish();
+    assert_eq!(common::head_ref(), "develop");
+}
@@ -0,0 +1,28 @@
+use std::process::Command;
+
+/// Run git in the current directory and assert that it succeeded.
+pub fn git(args: &[&str]) {
+    let status = Command::new("git").args(args).status().unwrap();
+    assert!(status.success(), "git {args:?} failed");
+}
+
+/// Run git in the current directory and return its trimmed stdout.
+pub fn git_stdout(args: &[&str]) -> String {
+    let output = Command::new("git").args(args).output().unwrap();
+    assert!(output.status.success(), "git {args:?} failed");
+    String::from_utf8(output.stdout).unwrap().trim().to_owned()
+}
+
+/// Initialise a repository on `branch` in the current directory with one
+/// empty commit.
+pub fn init_repo(branch: &str) {
+    git(&["init", "-b", branch]);
+    git(&["config", "user.email", "test@example.com"]);
+    git(&["config", "user.name", "Test User"]);
+    git(&["commit", "--allow-empty", "-m", "init"]);
+}
+
+/// Short name of the checked-out branch, or `HEAD` when detached.
+pub fn head_ref() -> String {
+    git_stdout(&["rev-parse", "--abbrev-ref", "HEAD"])
+}
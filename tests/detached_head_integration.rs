@@ -0,0 +1,20 @@
+mod common;
+
+use tempfile::tempdir;
+use vibe_git::{Idle, VibeSession};
+
+#[test]
+fn finish_returns_to_detached_commit() {
+    let dir = tempdir().unwrap();
+    std::env::set_current_dir(&dir).unwrap();
+    common::init_repo("master");
+    common::git(&["checkout", "--detach"]);
+    let detached = common::git_stdout(&["rev-parse", "HEAD"]);
+
+    let vibing = VibeSession::<Idle>::new("integration-branch").start();
+    assert!(vibing.base().is_none());
+
+    vibing.finish();
+    assert_eq!(common::head_ref(), "HEAD");
+    assert_eq!(common::git_stdout(&["rev-parse", "HEAD"]), detached);
+}
@@ -0,0 +1,21 @@
+mod common;
+
+use tempfile::tempdir;
+use vibe_git::{Idle, VibeSession};
+
+#[test]
+fn session_in_linked_worktree() {
+    let dir = tempdir().unwrap();
+    let main = dir.path().join("main");
+    std::fs::create_dir(&main).unwrap();
+    std::env::set_current_dir(&main).unwrap();
+    common::init_repo("main");
+    common::git(&["worktree", "add", "-b", "worktree-base", "../linked"]);
+
+    std::env::set_current_dir(dir.path().join("linked")).unwrap();
+    let vibing = VibeSession::<Idle>::new("integration-branch").start();
+    assert_eq!(vibing.base().unwrap().as_ref(), "worktree-base");
+
+    vibing.finish();
+    assert_eq!(common::head_ref(), "worktree-base");
+}